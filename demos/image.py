@@ -1,28 +1,27 @@
 # View a (large) image
 
 import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join("..")))
+try:
+    import tilewindow
+except ImportError:
+    sys.path.insert(0, os.path.abspath(".."))
 
 import tilewindow
 
 import tkinter as tk
 import tkinter.ttk as ttk
 import PIL.Image
+import functools
 
+# The widget never modifies the image it is given, so it is safe to share
+# the cached instance between calls.
+@functools.lru_cache(maxsize=4)
 def make_image(size="large"):
     if size == "large":
-        image = PIL.Image.new("RGB", (800, 600))
+        width, height = 800, 600
     else:
-        image = PIL.Image.new("RGB", (600, 400))
-    import array
-    data = array.array("B")
-    for y in range(image.height):
-        for x in range(image.width):
-            data.append(x % 256)
-            data.append(y % 256)
-            data.append((x+y) % 256)
-    image.frombytes(bytes(data))
-    return image
+        width, height = 600, 400
+    return PIL.Image.fromarray(tilewindow.util.testpattern(width, height))
 
 root = tk.Tk()
 tilewindow.util.stretch(root, [0], [0])
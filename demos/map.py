@@ -17,7 +17,10 @@ except:
 tilemapbase.start_logging()
 
 import os
-sys.path.insert(0, os.path.abspath(".."))
+try:
+    import tilewindow
+except ImportError:
+    sys.path.insert(0, os.path.abspath(".."))
 
 import tilewindow
 import tilewindow.tilemap as tilemap
@@ -52,6 +55,7 @@ print("Icon from http://www.flaticon.com/authors/madebyoliver CCBY 3.0")
 import tkinter as tk
 import tkinter.ttk as ttk
 import math
+import functools
 
 # Black
 #icon = 'iVBORw0KGgoAAAANSUhEUgAAABAAAAAQCAQAAAC1+jfqAAAABGdBTUEAALGPC/xhBQAAACBjSFJNAAB6JgAAgIQAAPoAAACA6AAAdTAAAOpgAAA6mAAAF3CculE8AAAAAmJLR0QAAKqNIzIAAAAJcEhZcwAADdcAAA3XAUIom3gAAAAHdElNRQfhCA8RLg//g+TqAAAAxElEQVQoz3XQIU5DQRSF4Q9o0wR2QJ5G4FgBBlNdg+gKQIBBIrsDFtEgaFJH2QCGNWDIM4QGAUE8wkV00jfDK/+oOeefSe6lZWSuVpsb6TAwFdmZGpTCpKhDmOR1pRHCj4U730JoVK0wTq8uwWm6jWEbHCXxFsw0bboS3pMwBCf6bdoDz0m4cexj9XWWYs9bZ4pXu/kc1x3hqtxD31NRP9r5u8tDX+v604ENXKyFMxvZ8iCEe/9SWVraz6NeIbw4F+o8+gU+mFx4n0ucRwAAACV0RVh0ZGF0ZTpjcmVhdGUAMjAxNy0wOC0xNVQxNzo0NjoxNSswMjowMILeaQYAAAAldEVYdGRhdGU6bW9kaWZ5ADIwMTctMDgtMTVUMTc6NDY6MTUrMDI6MDDzg9G6AAAAGXRFWHRTb2Z0d2FyZQB3d3cuaW5rc2NhcGUub3Jnm+48GgAAAABJRU5ErkJggg=='
@@ -62,6 +66,16 @@ import io, base64
 icon = base64.b64decode(icon)
 icon = PIL.Image.open(io.BytesIO(icon)).convert("RGBA")
 
+# Bound once, as these are formatted for every mouse movement
+lon_lat_text = "Longitude / Latitude : {:.6f},{:.6f}".format
+lon_lat_grid_text = "Longitude / Latitude : {:.6f},{:.6f} == {}".format
+
+@functools.lru_cache(maxsize=1024)
+def os_grid_reference(longitude, latitude):
+    """Projection is slow, and the mouse often revisits the same spot."""
+    x, y = tilemapbase.ordnancesurvey.project(longitude, latitude)
+    return tilemapbase.ordnancesurvey.coords_to_os_national_grid(x + 0.49, y + 0.49)
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -214,24 +228,37 @@ class App(tk.Tk):
         lon, lat = tilemapbase.ordnancesurvey.to_lonlat(x, y)
         return lon, lat
 
-    class MouseHandlerWebMercator(tilemap.MapMouseHandler):
+    class MouseHandlerLabel(tilemap.MapMouseHandler):
+        """Shows the mouse position in the info label.  Many motion events can
+        arrive between redraws, so only update the label once per idle cycle,
+        with the most recent position."""
         def __init__(self, parent):
             self.parent = parent
+            self._pending = None
 
         def notify(self, longitude, latitude):
-            if longitude is math.nan:
-                self.parent._info_label["text"] = ""
-            else:
-                self.parent._info_label["text"] = "Longitude / Latitude : {:.6f},{:.6f}".format(longitude, latitude)
+            if self._pending is None:
+                self.parent.after_idle(self._flush)
+            self._pending = (longitude, latitude)
 
-    class MouseHandlerOrdnance(tilemap.MapMouseHandler):
-        def __init__(self, parent):
-            self.parent = parent
+        def _flush(self):
+            longitude, latitude = self._pending
+            self._pending = None
+            self.parent._info_label["text"] = self.text(longitude, latitude)
 
-        def notify(self, longitude, latitude):
-            x, y = tilemapbase.ordnancesurvey.project(longitude, latitude)
-            code = tilemapbase.ordnancesurvey.coords_to_os_national_grid(x + 0.49, y + 0.49)
-            self.parent._info_label["text"] = "Longitude / Latitude : {:.6f},{:.6f} == {}".format(longitude, latitude, code)
+        def text(self, longitude, latitude):
+            raise NotImplementedError()
+
+    class MouseHandlerWebMercator(MouseHandlerLabel):
+        def text(self, longitude, latitude):
+            if longitude is math.nan:
+                return ""
+            return lon_lat_text(longitude, latitude)
+
+    class MouseHandlerOrdnance(MouseHandlerLabel):
+        def text(self, longitude, latitude):
+            code = os_grid_reference(round(longitude, 6), round(latitude, 6))
+            return lon_lat_grid_text(longitude, latitude, code)
 
 
 root = App()
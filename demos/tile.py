@@ -1,13 +1,17 @@
 # Demos infinite, procedurally generated tiles
 
 import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join("..")))
+try:
+    import tilewindow
+except ImportError:
+    sys.path.insert(0, os.path.abspath(".."))
 
 import tilewindow
 
 import tkinter as tk
 import tkinter.ttk as ttk
 import PIL.Image, PIL.ImageDraw, PIL.ImageFont
+import functools
 
 root = tk.Tk()
 tilewindow.util.centre_window_percentage(root, 50, 50)
@@ -16,26 +20,59 @@ tilewindow.util.stretch(root, [0], [0])
 font = PIL.ImageFont.truetype("arial.ttf", size=20)
 
 class OurProvider(tilewindow.TileProvider):
-    def __call__(self, tx, ty):
-        size = 128
-        image = PIL.Image.new("L", (size, size), color=255)
-        draw = PIL.ImageDraw.Draw(image)
+    def __init__(self, size=128):
+        # The border is the same for every tile, so draw it just once
+        self._template = PIL.Image.new("L", (size, size), color=255)
+        draw = PIL.ImageDraw.Draw(self._template)
         draw.line([(0, 0), (size-1, 0), (size-1, size-1), (0, size-1), (0, 0)])
-        draw.text((30,50), "({},{})".format(tx,ty), font=font)
+        # Only a few different characters appear in the labels, so rasterise
+        # each once, as a mask, instead of using freetype for every tile
+        ascent, descent = font.getmetrics()
+        self._glyphs = dict()
+        for ch in "()-,0123456789":
+            left, top, right, bottom = font.getbbox(ch)
+            mask = PIL.Image.new("L", (max(1, right), max(bottom, ascent + descent)))
+            PIL.ImageDraw.Draw(mask).text((0, 0), ch, font=font, fill=255)
+            self._glyphs[ch] = (mask, font.getlength(ch))
+        # Tiles are revisited as the user pans, so avoid re-rendering them
+        self._render = functools.lru_cache(maxsize=512)(self._render_tile)
+
+    def __call__(self, tx, ty):
+        # Tiles are never modified by the widget, so can be shared
+        return self._render(tx, ty)
+
+    def _render_tile(self, tx, ty):
+        image = self._template.copy()
+        x = 30
+        for ch in "({},{})".format(tx,ty):
+            mask, advance = self._glyphs[ch]
+            image.paste(0, (int(x), 50), mask)
+            x += advance
         return image
 
 image = tilewindow.TileImage(root, OurProvider(), 128)
 image.grid(row=0, column=0, sticky=tk.NSEW)
 
+position_text = "Current position: ({},{})".format
+
 class PositionPrinter(tilewindow.image.MouseHandlerChain):
     def __init__(self, parent, delegate):
         super().__init__(delegate)
         self.label = ttk.Label(parent)
+        self._pending = None
 
     def notify(self, x, y):
-        self.label["text"] = "Current position: ({},{})".format(x, y)
+        # Only update the label once per idle cycle, with the latest position
+        if self._pending is None:
+            self.label.after_idle(self._flush)
+        self._pending = (x, y)
         super().notify(x, y)
 
+    def _flush(self):
+        x, y = self._pending
+        self._pending = None
+        self.label["text"] = position_text(x, y)
+
 image["cursor"] = "crosshair"
 
 frame = ttk.Frame(root)
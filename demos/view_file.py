@@ -1,7 +1,10 @@
 # Display a image and allow zooming in and out and scrolling
 
 import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join("..")))
+try:
+    import tilewindow
+except ImportError:
+    sys.path.insert(0, os.path.abspath(".."))
 
 import tilewindow
 
@@ -35,13 +38,24 @@ yscroll.set_to_hide()
 frame = ttk.Frame(root)
 frame.grid(sticky=tk.NSEW, row=0)
 def no_zoom():
+    image_widget.set_image(image, allow_zoom=True)
     image_widget.zoom = 1.0
 ttk.Button(frame, text="Restore zoom", command=no_zoom).grid(row=0, column=0)
 def zoom():
     w, h = image_widget.size
-    zw = w / image.width
-    zh = h / image.height
-    image_widget.zoom = min(zw, zh)
+    if image.width <= w and image.height <= h:
+        # `thumbnail` only ever shrinks, so let the widget enlarge the image
+        image_widget.set_image(image, allow_zoom=True)
+        image_widget.zoom = min(w / image.width, h / image.height)
+        return
+    # Shrink once, to fit the window, rather than the widget resizing the full
+    # image on every redraw.  `image` is already decoded, so open the file
+    # afresh: for JPEGs, `thumbnail` can then use `draft` to have the decoder
+    # downscale (by 1/2, 1/4 or 1/8) first.
+    with PIL.Image.open(filename) as fitted:
+        fitted.thumbnail((w, h), resample=getattr(PIL.Image, "Resampling", PIL.Image).LANCZOS)
+    image_widget.set_image(fitted, allow_zoom=True)
+    image_widget.zoom = 1.0
 ttk.Button(frame, text="Zoom to window", command=zoom).grid(row=0, column=1)
 
 root.mainloop()
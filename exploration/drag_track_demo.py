@@ -5,7 +5,10 @@
 #    then you can drag the canvas indefinitely!
 
 import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join("..")))
+try:
+    import tilewindow
+except ImportError:
+    sys.path.insert(0, os.path.abspath(".."))
 
 import tilewindow.util.util as util
 from tilewindow.util.drag_track import DragTrack
@@ -51,10 +54,19 @@ class CanvasTracker(DragTrack):
         self.move_rect_id = canvas.create_rectangle(150, 70, 170, 90, width=1, fill="red")
         self._grabbed = None
         canvas.config(scrollregion=(-50,-50, 350,250))
+        # The rectangles never move, and the view only moves when we scroll it
+        # (or the canvas is resized), so cache these rather than asking `tk`
+        # on every event.
+        self._bboxes = {i : canvas.bbox(i) for i in (self.rect_id, self.move_rect_id)}
+        self._update_offset()
+        canvas.bind("<Configure>", self._update_offset)
+
+    def _update_offset(self, event=None):
+        self._ox, self._oy = self.canvas.canvasx(0), self.canvas.canvasy(0)
         
     def _in_rect(self, event, rect_id):
-        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
-        minx, miny, maxx, maxy = self.canvas.bbox(rect_id)
+        x, y = event.x + self._ox, event.y + self._oy
+        minx, miny, maxx, maxy = self._bboxes[rect_id]
         return ( minx <= x and x <= maxx and miny <= y and y <= maxy )
         
     def notify(self, event, what):
@@ -62,7 +74,7 @@ class CanvasTracker(DragTrack):
             if self._in_rect(event, self.rect_id):
                 return True
             if self._in_rect(event, self.move_rect_id):
-                self._grabbed = event.x - self.canvas.canvasx(event.x), event.y - self.canvas.canvasy(event.y)
+                self._grabbed = -self._ox, -self._oy
         if what == "up":
             self._grabbed = None
         return False
@@ -84,6 +96,7 @@ class CanvasTracker(DragTrack):
             x = dx + self._grabbed[0]
             y = dy + self._grabbed[1]
             canvas.scan_dragto(int(x), int(y), gain=1)
+            self._update_offset()
 
     def released(self):
         self.canvas.itemconfigure(self.text_id, text = "click here!")
@@ -2,7 +2,10 @@
 # resizable window.
 
 import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join("..")))
+try:
+    import tilewindow
+except ImportError:
+    sys.path.insert(0, os.path.abspath(".."))
 
 import tilewindow.util.util as util
 from tilewindow.util.drag_track import DragTrack
@@ -37,16 +40,7 @@ class OurTrack(DragTrack):
 
 
     def make_image(self):
-        image = PIL.Image.new("RGB", (1000, 800))
-        import array
-        data = array.array("B")
-        for y in range(800):
-            for x in range(1000):
-                data.append(x % 256)
-                data.append(y % 256)
-                data.append((x+y) % 256)
-        image.frombytes(bytes(data))
-        return image
+        return PIL.Image.fromarray(util.testpattern(1000, 800))
 
     def moved(self, dx, dy, new):
         # Also possible to move the image itself.
@@ -3,7 +3,10 @@
 # text widget to be inside the notion width/height of the canvas
 
 import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join("..")))
+try:
+    import tilewindow
+except ImportError:
+    sys.path.insert(0, os.path.abspath(".."))
 
 import tilewindow.util.util as util
 
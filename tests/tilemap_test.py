@@ -64,3 +64,123 @@ def test_DroppedPins_process(icon):
     assert out == tile.convert.return_value
     assert len(out.paste.call_args_list) == 1
     assert out.paste.call_args_list[0][0][1] == (205-8, 6-15)
+
+def test_project_matches_tilemapbase():
+    import tilemapbase
+    for lon, lat in [(0, 0), (-1.55, 53.8), (179.9, -85), (-180, 84.9)]:
+        np.testing.assert_allclose(tilemap._project(lon, lat), tilemapbase.project(lon, lat))
+        x, y = tilemapbase.project(lon, lat)
+        np.testing.assert_allclose(tilemap._to_lonlat(x, y), tilemapbase.to_lonlat(x, y))
+
+    with pytest.raises(ValueError):
+        tilemap._project(0, 90)
+
+def test_WebMercatorTiles_lon_lat_to_tile_space_array():
+    source = mock.Mock()
+    source.tilesize = 256
+    source.maxzoom = 18
+    tiles = tilemap.WebMercatorTiles(source)
+    tiles.zoom = 5
+    lons, lats = [-1.55, 0, 100], [53.8, 0, -40]
+    x, y = tiles.lon_lat_to_tile_space_array(lons, lats)
+    for lon, lat, xx, yy in zip(lons, lats, x, y):
+        np.testing.assert_allclose((xx, yy), tiles.lon_lat_to_tile_space(lon, lat))
+
+    dp = tilemap.DroppedPins(PIL.Image.new("RGBA", (16,16)), (8,15), tiles)
+    dp.locations = list(zip(lons, lats))
+    np.testing.assert_allclose(dp.locations, np.stack([x, y], axis=1))
+
+    with pytest.raises(ValueError):
+        tiles.lon_lat_to_tile_space_array([0], [90])
+
+def test_WebMercatorTiles_approximate():
+    source = mock.Mock()
+    source.tilesize = 256
+    source.maxzoom = 18
+    exact = tilemap.WebMercatorTiles(source)
+    approx = tilemap.WebMercatorTiles(source)
+    assert not approx.approximate
+    approx.approximate = True
+    for zoom in [5, 12, 18]:
+        exact.zoom, approx.zoom = zoom, zoom
+        for lat in np.linspace(53.79, 53.81, 50):
+            x, y = exact.lon_lat_to_tile_space(-1.55, lat)
+            np.testing.assert_allclose(approx.lon_lat_to_tile_space(-1.55, lat), (x, y), atol=0.5)
+            lon, la = approx.tile_space_to_lon_lat(x, y + 7)
+            np.testing.assert_allclose(exact.lon_lat_to_tile_space(lon, la), (x, y + 7), atol=0.5)
+
+    with pytest.raises(ValueError):
+        approx.lon_lat_to_tile_space(-190, 53.8)
+
+def test_WebMercatorTiles_caches_tiles():
+    source = mock.Mock()
+    source.tilesize = 256
+    source.maxzoom = 18
+    tiles = tilemap.WebMercatorTiles(source)
+    tiles.zoom = 2
+
+    assert tiles(5, 1) is source.get_tile.return_value
+    assert tiles(1, 1) is source.get_tile.return_value
+    source.get_tile.assert_called_once_with(1, 1, 2)
+    tiles.zoom = 3
+    tiles(1, 1)
+    source.get_tile.assert_called_with(1, 1, 3)
+
+    source.get_tile.return_value = None
+    assert tiles(2, 2) is None
+    assert tiles(2, 2) is None
+    assert source.get_tile.call_count == 4
+
+def test_DroppedPins_process_many(icon):
+    source = mock.Mock()
+    source.lon_lat_to_tile_space.side_effect = lambda x, y : (x, y)
+    dp = tilemap.DroppedPins(icon, (8,15), source)
+    locations = np.random.RandomState(7).uniform(-500, 500, size=(200, 2))
+    dp.locations = locations
+
+    tile = mock.Mock()
+    tile.mode = "RGB"
+    tile.width, tile.height = 100, 50
+    corners = locations - [8, 15]
+    for tx in range(-6, 6):
+        for ty in range(-11, 11):
+            tile.reset_mock()
+            out = dp.process(tile, tx, ty)
+            px, py = corners[:,0] - tx * 100, corners[:,1] - ty * 50
+            expected = sorted((int(x), int(y)) for x, y in zip(px, py)
+                if -16 < x < 100 and -16 < y < 50)
+            if len(expected) == 0:
+                assert out is tile
+            else:
+                assert sorted(c[0][1] for c in out.paste.call_args_list) == expected
+
+class OurOSTiles(tilemap.OrdnanceSurveyTiles):
+    def __init__(self):
+        self._tile_provider = mock.Mock()
+        self._tile_provider.tilesize = 200
+        self._tile_provider.size_in_meters = 1000
+        self._tile_provider.bounding_box = (0, 0, 700000, 1300000)
+        super().__init__()
+
+def test_OrdnanceSurveyTiles_lon_lat_to_tile_space_array():
+    def project(lon, lat):
+        return np.asarray(lon) * 10000 + 400000, np.asarray(lat) * 10000 - 100000
+    tiles = OurOSTiles()
+    lons, lats = [-1.55, -3.2, 0.9], [53.8, 51.5, 57.1]
+    with mock.patch("tilemapbase.ordnancesurvey.project", project):
+        x, y = tiles.lon_lat_to_tile_space_array(lons, lats)
+        for lon, lat, xx, yy in zip(lons, lats, x, y):
+            assert (xx, yy) == tiles.lon_lat_to_tile_space(lon, lat)
+
+        dp = tilemap.DroppedPins(PIL.Image.new("RGBA", (16,16)), (8,15), tiles)
+        dp.locations = list(zip(lons, lats))
+        np.testing.assert_allclose(dp.locations, np.stack([x, y], axis=1))
+
+def test_OrdnanceSurveyTiles_failed_fetch_not_cached():
+    tiles = OurOSTiles()
+    tile = PIL.Image.new("RGB", (200, 200))
+    tiles._tile_provider.side_effect = [OSError(), tile]
+    assert tiles(10, -20) is None
+    assert tiles(10, -20) is tile
+    assert tiles(10, -20) is tile
+    assert tiles._tile_provider.call_count == 2
@@ -137,6 +137,21 @@ def test_get(tlr):
     
     assert needed_tiles == set(itertools.product([-1,0,1,2,3], [-1,0,1,2,3,4,5]))
 
+def test_drain(tlr):
+    tlr.update((10, 10), (35, 78))
+    tlr.get(timeout=0.1)
+    needed_tiles = tlr.drain()
+    assert len(needed_tiles) == 34
+    assert tlr.drain() == []
+    with pytest.raises(queue.Empty):
+        tlr.get(timeout=0.1)
+
+def test_TileJobMarsher_order():
+    marsher = tiler._TileJobMarsher()
+    marsher.set_needed_tiles([(1,2), (-3,4), (5,-6)])
+    assert marsher.get(timeout=0.1) == (5, -6)
+    assert marsher.drain() == [(-3,4), (1,2)]
+
 def test_get_replaces_midway(tlr):
     tlr.update((10, 10), (35, 78))
     for _ in range(4):
@@ -171,6 +186,92 @@ def test_new_tile(tlr):
     
     assert needed_tiles == set(itertools.product([-2], [-1,0,1]))
 
+def _colour(tx, ty):
+    return ((tx * 37) % 256, (ty * 59) % 256, 100)
+
+def _check_image(tlr):
+    image = tlr._image
+    xmin, ymin, xmax, ymax = tlr.buffer_extent
+    for tx in range(xmin // 20, xmax // 20):
+        for ty in range(ymin // 20, ymax // 20):
+            pixel = image.getpixel((tx * 20 - xmin + 5, ty * 20 - ymin + 5))
+            assert pixel == _colour(tx, ty)
+
+def test_update_reuses_buffer(tlr):
+    tlr.redrawer = mock.Mock()
+    for location in [(10, 10), (50, 50), (50, 90), (-30, 20), (500, 500)]:
+        tlr.update(location, (35, 78))
+        for tile_key in tlr.drain():
+            tlr.new_tile(*tile_key, PIL.Image.new("RGB", (20,20), _colour(*tile_key)))
+        _check_image(tlr)
+
+def test_update_blanks_missing_tiles(tlr):
+    tlr.redrawer = mock.Mock()
+    tlr.update((10, 10), (35, 78))
+    for tile_key in tlr.drain():
+        tlr.new_tile(*tile_key, PIL.Image.new("RGB", (20,20), _colour(*tile_key)))
+    tlr.update((50, 50), (35, 78))
+    missing = set(tlr.drain())
+    assert len(missing) > 0
+    xmin, ymin, _, _ = tlr.buffer_extent
+    for tx, ty in missing:
+        tile = tlr._image.crop((tx * 20 - xmin, ty * 20 - ymin, tx * 20 - xmin + 20, ty * 20 - ymin + 20))
+        assert tile.getextrema() == ((0, 0), (0, 0), (0, 0))
+
+def test_tiles_kept_when_scrolling_back(tlr):
+    tlr.redrawer = mock.Mock()
+    tlr.update((10, 10), (35, 78))
+    for tile_key in tlr.drain():
+        tlr.new_tile(*tile_key, PIL.Image.new("RGB", (20,20), _colour(*tile_key)))
+    # `location` is relative to the current buffer
+    tlr.update((200 - tlr.buffer_extent[0], 200 - tlr.buffer_extent[1]), (35, 78))
+    tlr.drain()
+    tlr.update((10 - tlr.buffer_extent[0], 10 - tlr.buffer_extent[1]), (35, 78))
+    assert tlr.buffer_extent == (-20, -20, 80, 120)
+    assert tlr.drain() == []
+    _check_image(tlr)
+
+def test_tiles_nearest_centre_first(tlr):
+    tlr.update((50, 50), (40, 40))
+    # Window is (50,50)--(90,90), so centred in tile (3,3)
+    assert tlr.get(timeout=0.1) == (3, 3)
+    needed = [tlr.get(timeout=0.1) for _ in range(3)]
+    assert set(needed) <= {(2,3), (3,2), (4,3), (3,4)}
+
+def test_clear_cache(tlr):
+    tlr.redrawer = mock.Mock()
+    tlr.update((10, 10), (35, 78))
+    for tile_key in tlr.drain():
+        tlr.new_tile(*tile_key, PIL.Image.new("RGB", (20,20), _colour(*tile_key)))
+    extent = tlr.buffer_extent
+    tlr.clear_cache()
+    assert tlr.buffer_extent == extent
+    assert len(tlr.drain()) == 35
+    assert tlr._image.getextrema() == ((0, 0), (0, 0), (0, 0))
+    assert len(tlr.redrawer.call_args_list) == 2
+
+def test_update_scrolled_past_bounds(tlr):
+    tlr.redrawer = mock.Mock()
+    tlr.image_bounds = (None, 0, None, 200)
+    tlr.update((0, 0), (40, 40))
+    for tile_key in tlr.drain():
+        tlr.new_tile(*tile_key, PIL.Image.new("RGB", (20,20), _colour(*tile_key)))
+    tlr.update((0, 400), (40, 40))
+    assert tlr.buffer_extent == (-40, 380, 40, 200)
+    assert tlr.drain() == []
+    assert len(tlr._tiles) > 0
+
+def test_clear_cache_drops_tiles_in_flight(tlr):
+    tlr.redrawer = mock.Mock()
+    tlr.update((10, 10), (35, 78))
+    generation = tlr.generation
+    tx, ty = tlr.get(timeout=0.1)
+    tlr.clear_cache()
+    assert tlr.generation != generation
+    tlr.new_tile(tx, ty, PIL.Image.new("RGB", (20,20), (255, 255, 255)), generation)
+    assert (tx, ty) not in tlr._tiles
+    assert (tx, ty) in tlr.drain()
+
 def test_redrawer(tlr):
     mock_drawer = mock.Mock()
     tlr.redrawer = mock_drawer
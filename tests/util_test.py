@@ -0,0 +1,27 @@
+import pytest
+
+from tilewindow.util import util
+
+import PIL.Image
+
+def test_testpattern():
+    data = util.testpattern(300, 2)
+    assert data.shape == (2, 300, 3)
+    assert data.dtype == "uint8"
+    assert tuple(data[0, 0]) == (0, 0, 0)
+    assert tuple(data[0, 1]) == (1, 0, 1)
+    assert tuple(data[0, 257]) == (1, 0, 1)
+    assert tuple(data[1, 0]) == (0, 1, 1)
+    assert tuple(data[1, 255]) == (255, 1, 0)
+
+def test_testpattern_is_cached():
+    data = util.testpattern(10, 20)
+    assert data is util.testpattern(10, 20)
+    with pytest.raises(ValueError):
+        data[0, 0, 0] = 5
+
+def test_testpattern_to_image():
+    image = PIL.Image.fromarray(util.testpattern(30, 20))
+    assert image.mode == "RGB"
+    assert image.size == (30, 20)
+    assert image.getpixel((5, 7)) == (5, 7, 12)
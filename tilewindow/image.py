@@ -11,7 +11,14 @@ import tkinter.ttk as ttk
 from .util import util
 from .util import scrollbars
 from tilewindow.util.drag_track import DragTrack
-import PIL.ImageTk, PIL.Image
+
+# For each anchor, how to align the image horizontally and vertically when it
+# is smaller than the canvas: 0 = left/top, 1 = centre, 2 = right/bottom
+_ANCHOR_ALIGNMENT = {
+    tk.NW : (0, 0), tk.N : (1, 0), tk.NE : (2, 0),
+    tk.W : (0, 1), tk.CENTER : (1, 1), tk.E : (2, 1),
+    tk.SW : (0, 2), tk.S : (1, 2), tk.SE : (2, 2)
+    }
 
 class Image(tk.Canvas):
     """A subclass of :class:`tkinter.Canvas` which supports displaying an image
@@ -46,13 +53,18 @@ class Image(tk.Canvas):
       constructor.
     """
     def __init__(self, parent, free=False, anchor=tk.CENTER, **kwargs):
+        self._xscroll_command, self._yscroll_command = None, None
         super().__init__(parent, **self._init_adjust_kwargs(kwargs))
         self._image_id = self.create_image(0, 0, anchor=tk.NW)
         self.bind("<Configure>", self._conf)
         self._photo = None
         self._image = None
+        self._image_photo = None
+        self._zoom_photo = None
         self._current_location = (0, 0)
         self._needed_width, self._needed_height = 0, 0
+        self._photo_width, self._photo_height = 0, 0
+        self._layout_dirty = True
         self.anchor = anchor
         self.free = free
         self._tracker = self._OurTracker(self)
@@ -75,12 +87,28 @@ class Image(tk.Canvas):
         :param location: If not `None` then also update the current view
           position.
         """
-        self.set_photo(PIL.ImageTk.PhotoImage(image), location)
+        self.set_photo(self._photo_for_image(image), location)
+        self._zoom_photo = None
         if allow_zoom:
             self._image = image
         else:
             self._image = None
 
+    def _photo_for_image(self, image):
+        """Convert `image` to a :class:`PIL.ImageTk.PhotoImage`.  If the photo
+        currently displayed was made by us from an image of the same mode and
+        size, then paste into it instead of allocating a new `tkinter` image.
+        """
+        if self._image_photo is not None:
+            photo, mode, size = self._image_photo
+            if photo is self._photo and mode == image.mode and size == image.size:
+                photo.paste(image)
+                return photo
+        import PIL.ImageTk
+        photo = PIL.ImageTk.PhotoImage(image)
+        self._image_photo = (photo, image.mode, image.size)
+        return photo
+
     def set_photo(self, photo, location=None):
         """Set the displayed image.  Does not change the view if this is
         possible, given the new image size.  We capture a reference to the
@@ -91,7 +119,11 @@ class Image(tk.Canvas):
           position.
         """
         self._photo = photo
-        self.itemconfigure(self._image_id, image=self._photo)
+        # Each query of the photo's size is a round-trip to `tcl`
+        self._photo_width, self._photo_height = photo.width(), photo.height()
+        self._layout_dirty = True
+        # Direct call, to skip the option parsing of `itemconfigure`
+        self.tk.call(self._w, "itemconfigure", self._image_id, "-image", self._photo)
         if location is not None:
             dx = location[0] - self._current_location[0]
             dy = location[1] - self._current_location[1]
@@ -108,14 +140,31 @@ class Image(tk.Canvas):
     def zoom(self, z):
         if self._image is None:
             raise ValueError("No stored image to zoom from")
+        import PIL.Image, PIL.ImageTk
         self._zoom = float(z)
+        factor = 1 / self._zoom
+        w = int(self._image.width * self._zoom)
+        h = int(self._image.height * self._zoom)
+        if self._zoom_photo is not None and self._zoom_photo[0] == (w, h):
+            self.set_photo(self._zoom_photo[1])
+            return
         if abs(self._zoom - 1) < 1e-5:
-            self.set_photo(PIL.ImageTk.PhotoImage(self._image))
+            if self._image_photo is not None:
+                photo, mode, size = self._image_photo
+                if mode == self._image.mode and size == self._image.size:
+                    # Already converted by `set_image`
+                    self.set_photo(photo)
+                    return
+            image = self._image
+        elif factor > 1 and abs(factor - round(factor)) < 1e-5:
+            # Integer zoom out: `reduce` is a (much faster) box filter
+            image = self._image.reduce(int(round(factor)))
         else:
-            w = int(self._image.width * self.zoom)
-            h = int(self._image.height * self.zoom)
-            image = self._image.resize((w,h), PIL.Image.ANTIALIAS)
-            self.set_photo(PIL.ImageTk.PhotoImage(image))
+            # `Resampling` is only in Pillow >= 9.1
+            image = self._image.resize((w,h), getattr(PIL.Image, "Resampling", PIL.Image).LANCZOS)
+        photo = PIL.ImageTk.PhotoImage(image)
+        self._zoom_photo = ((w, h), photo)
+        self.set_photo(photo)
 
     @property
     def anchor(self):
@@ -125,9 +174,10 @@ class Image(tk.Canvas):
 
     @anchor.setter
     def anchor(self, v):
-        if v not in {tk.CENTER, tk.N, tk.NE, tk.E, tk.SE, tk.S, tk.SW, tk.W, tk.NW}:
+        if v not in _ANCHOR_ALIGNMENT:
             raise ValueError()
         self._image_anchor = v
+        self._layout_dirty = True
         self._redraw()
 
     @property
@@ -140,6 +190,7 @@ class Image(tk.Canvas):
     @free.setter
     def free(self, v):
         self._free = bool(v)
+        self._layout_dirty = True
         self._redraw()
 
     def move_to(self, x, y):
@@ -153,49 +204,50 @@ class Image(tk.Canvas):
         if self._free:
             self._current_location = (x, y)
             self.scan_dragto(-x, -y, gain=1)
-            xx = self._needed_width - self._photo.width() + x
-            yy = self._needed_height - self._photo.height() + y
+            xx = self._needed_width - self._photo_width + x
+            yy = self._needed_height - self._photo_height + y
             self.notify_of_gap(-x, -y, xx, yy)
         else:
             self._move_to_adjusted(x, y)
 
     def _move_to_adjusted(self, x, y):
-        x, y = max(0, int(x)), max(0, int(y))
-        extra_x = int(self._photo.width() - self._needed_width)
-        if extra_x < 0:
-            x = 0
-        else:
-            x = min(x, extra_x)
-        extra_y = int(self._photo.height() - self._needed_height)
-        if extra_y < 0:
-            y = 0
-        else:
-            y = min(y, extra_y)
+        # Nothing which affects the layout has changed, so neither will we
+        if not self._layout_dirty and (x, y) == self._current_location:
+            return
+        x, y, xx, yy = self._clamp_and_anchor(x, y)
         self._current_location = (x, y)
-        
-        xx, yy = x, y
-        if extra_x < 0:
-            if self._image_anchor in {tk.NW, tk.W, tk.SW}:
-                xx = 0
-            elif self._image_anchor in {tk.NE, tk.E, tk.SE}:
-                xx = extra_x
-            else:
-                xx = int(extra_x // 2)
-        if extra_y < 0:
-            if self._image_anchor in {tk.NW, tk.N, tk.NE}:
-                yy = 0
-            elif self._image_anchor in {tk.SE, tk.S, tk.SW}:
-                yy = extra_y
-            else:
-                yy = int(extra_y // 2)
-        
+        extra_x = self._photo_width - self._needed_width
+        extra_y = self._photo_height - self._needed_height
+
         # Where the _canvas_ will be moved to; the image is always at (0, 0)
         self.scan_dragto(-xx, -yy, gain=1)
         self.notify_of_gap(-xx, -yy, xx - extra_x, yy - extra_y)
-        xt = self._photo.width()
+        xt = self._photo_width
         self._update_xscroll(max(0, xx / xt), min(1, 1 - (extra_x - xx) / xt))
-        yt = self._photo.height()
+        yt = self._photo_height
         self._update_yscroll(max(0, yy / yt), min(1, 1 - (extra_y - yy) / yt))
+        self._layout_dirty = False
+
+    def _clamp_and_anchor(self, x, y):
+        """Clamp the location `(x, y)` to the photo, and work out where the
+        canvas should be moved to, allowing for :attr:`anchor` when the photo
+        is smaller than the canvas.
+
+        :return: `(x, y, xx, yy)` where `(x, y)` is the clamped location, and
+          `(xx, yy)` is the canvas position.
+        """
+        extra_x = self._photo_width - self._needed_width
+        extra_y = self._photo_height - self._needed_height
+        ax, ay = _ANCHOR_ALIGNMENT[self._image_anchor]
+        if extra_x < 0:
+            x, xx = 0, (0, extra_x // 2, extra_x)[ax]
+        else:
+            x = xx = min(max(0, int(x)), extra_x)
+        if extra_y < 0:
+            y, yy = 0, (0, extra_y // 2, extra_y)[ay]
+        else:
+            y = yy = min(max(0, int(y)), extra_y)
+        return x, y, xx, yy
 
     @property
     def current_location(self):
@@ -267,13 +319,17 @@ class Image(tk.Canvas):
 
     def xview(self, how, *args):
         """Our handling of the standard `xview`."""
-        diff = self._xy_view(how, args, self._xstart, self._xend, self._photo.width())
+        diff = self._xy_view(how, args, self._xstart, self._xend, self._photo_width)
+        if abs(diff) < 1:
+            return
         x, y = self.current_location
         self._move_to_adjusted(x + diff, y)
 
     def yview(self, how, *args):
         """Our handling of the standard `yview`."""
-        diff = self._xy_view(how, args, self._ystart, self._yend, self._photo.height())
+        diff = self._xy_view(how, args, self._ystart, self._yend, self._photo_height)
+        if abs(diff) < 1:
+            return
         x, y = self.current_location
         self._move_to_adjusted(x, y + diff)
 
@@ -307,27 +363,32 @@ class Image(tk.Canvas):
     def __setitem__(self, key, value):
         if key == "xscrollcommand":
             self._xscroll_command = value
+            self._layout_dirty = True
         elif key == "yscrollcommand":
             self._yscroll_command = value
+            self._layout_dirty = True
         else:
             super().__setitem__(key, value)
 
     def _update_xscroll(self, start, end):
         """If we have set the `xscrollcommand` then call it."""
-        if hasattr(self, "_xscroll_command") and self._xscroll_command is not None:
+        command = self._xscroll_command
+        if command is not None:
             self._xstart, self._xend = start, end
-            self._xscroll_command(start, end)
+            command(start, end)
 
     def _update_yscroll(self, start, end):
         """If we have set the `yscrollcommand` then call it."""
-        if hasattr(self, "_yscroll_command") and self._yscroll_command is not None:
+        command = self._yscroll_command
+        if command is not None:
             self._ystart, self._yend = start, end
-            self._yscroll_command(start, end)
+            command(start, end)
 
     def _conf(self, event):
         """Captures the widget being resized."""
         self._needed_width = self.winfo_width()
         self._needed_height = self.winfo_height()
+        self._layout_dirty = True
         self._redraw()
 
     def _redraw(self):
@@ -339,15 +400,25 @@ class Image(tk.Canvas):
             super().__init__(canvas)
             self._parent = canvas
             self._bias = 0, 0
+            self._pending_motion = None
             self.mouse_handler = None
 
         def notify(self, event, what):
             if self.mouse_handler is None:
                 return False
             if what == "motion":
-                self._parent.after_idle(lambda x=event.x, y=event.y : self._eventual_notify(x, y))
+                # Only the most recent position is reported, once per idle
+                if self._pending_motion is None:
+                    self._parent.after_idle(self._flush_motion)
+                self._pending_motion = (event.x, event.y)
             return self.mouse_handler.handle(event, what)
 
+        def _flush_motion(self):
+            x, y = self._pending_motion
+            self._pending_motion = None
+            if self.mouse_handler is not None:
+                self._eventual_notify(x, y)
+
         def _eventual_notify(self, x, y):
             x += self._parent.current_location[0]
             y += self._parent.current_location[1]
@@ -10,6 +10,39 @@ import PIL.ImageDraw as _ImageDraw
 import math as _math
 import numpy as _np
 import threading as _threading
+import functools as _functools
+
+def _project(longitude, latitude):
+    """Project longitude / latitude to the unit square in the "Web Mercator"
+    projection.  As :func:`tilemapbase.project`, but using that
+    `log(tan(x) + sec(x)) == asinh(tan(x))` to save a few operations."""
+    if longitude < -180 or longitude > 180 or latitude <= -90 or latitude >= 90:
+        raise ValueError("Longitude/Latitude ({}/{}) is out of valid range [-180,180] / [-90,90].".format(longitude, latitude))
+    x = (longitude + 180.0) / 360.0
+    y = 0.5 - _math.asinh(_math.tan(latitude * _DEGREES_TO_RADIANS)) / (2 * _math.pi)
+    return x, y
+
+def _to_lonlat(x, y):
+    """Inverse of :func:`_project`.  As :func:`tilemapbase.to_lonlat`."""
+    return x * 360 - 180, _math.atan(_math.sinh(_math.pi * (1 - y * 2))) * _RADIANS_TO_DEGREES
+
+_DEGREES_TO_RADIANS = _math.pi / 180
+_RADIANS_TO_DEGREES = 180 / _math.pi
+
+class _NoTile(Exception):
+    """Raised internally when a tile source fails to provide a tile."""
+    pass
+
+@_functools.lru_cache(maxsize=8)
+def _empty_tile(tile_size):
+    """The tile displayed outside of the map: a white square with a cross.
+    Shared between all users, as tiles are never modified."""
+    tile = _Image.new("L", (tile_size, tile_size), 255)
+    draw = _ImageDraw.Draw(tile)
+    draw.line((0,0,tile_size,tile_size))
+    draw.line((0,tile_size,tile_size,0))
+    return tile
+
 
 class MapImage(tiler.TileImage):
     """A `tkinter` widget which displays a draggable map.
@@ -26,12 +59,17 @@ class MapImage(tiler.TileImage):
     :param parent: The parent `tkinter` widget.
     :param source: The source of tiles.  One of :class:`WebMercatorTiles` or
       one of the :class:`OrdnanceSurveyTiles` subclasses.
+    :param workers: The number of threads fetching tiles.  By default, 4 for
+      :class:`WebMercatorTiles`, which mostly wait on the network, and 1
+      otherwise, as Ordnance Survey tiles are read one at a time anyway.
     """
-    def __init__(self, parent, source):
+    def __init__(self, parent, source, workers=None):
+        if workers is None:
+            workers = 4 if isinstance(source, WebMercatorTiles) else 1
         self._source = source
         map_mouse_handler = None
         self._composer = self._Composer(source, self)
-        super().__init__(parent, self._composer, source.tile_size)
+        super().__init__(parent, self._composer, source.tile_size, workers=workers)
         self.mouse_handler = None
         self.tiler.image_bounds = source.bbox
 
@@ -83,8 +121,10 @@ class MapImage(tiler.TileImage):
 
     def set_composer(self, composer):
         """Set the :class:`Composer` instance.  Pass `None` to turn off
-        composing."""
+        composing.  If the output of the composer later changes (for example,
+        new pin locations) then call :meth:`clear_cache`."""
         self._composer.composer = composer
+        self.clear_cache()
 
     class _MapImageMouseHandler(image.MouseHandlerChain):
         def __init__(self, parent, delegate=None):
@@ -107,8 +147,8 @@ class MapImage(tiler.TileImage):
 
         @property
         def composer(self):
-            with self._lock:
-                return self._composer
+            # Reading a single reference is atomic; only writes take the lock
+            return self._composer
 
         @composer.setter
         def composer(self, v):
@@ -117,8 +157,8 @@ class MapImage(tiler.TileImage):
 
         def __call__(self, tx, ty):
             tile = self.source(tx, ty)
-            comp = self.composer
-            if comp is not None:
+            comp = self._composer
+            if comp is not None and tile is not None:
                 tile = comp.process(tile, tx, ty)
             return tile
 
@@ -160,8 +200,7 @@ class DroppedPins(Composer):
     def __init__(self, icon, centre, source):
         if icon.mode != "RGBA":
             raise ValueError("Must be an RGBA mode icon")
-        self._alpha = _Image.new("L", icon.size)
-        self._alpha.frombytes( icon.tobytes()[3::4] )
+        self._alpha = icon.getchannel("A")
         self._icon = icon.convert("RGB")
         self._offset = _np.asarray(centre)
         self._source = source
@@ -170,38 +209,83 @@ class DroppedPins(Composer):
     @property
     def locations(self):
         """An array of locations, `(longitude, latitude)`.
-        (Internally, a `numpy` array of shape (N,2)).
+        (Internally, a `numpy` array of shape (N,2)).  After changing, call
+        :meth:`MapImage.clear_cache` so that the map is redrawn.
         """
-        return self._locations
+        return _np.column_stack((self._px, self._py))
 
     @locations.setter
     def locations(self, v):
-        self._locations = _np.asarray(v)
-        if len(self._locations) == 0:
+        locations = _np.asarray(v, dtype=_np.float64)
+        if len(locations) == 0:
+            self._px, self._py = _np.empty(0), _np.empty(0)
+            self._pins = (self._px, self._py, dict())
             return
-        if len(self._locations.shape) == 1:
-            self._locations = self._locations[None,:]
-        if self._locations.shape[1] != 2:
+        if len(locations.shape) == 1:
+            locations = locations[None,:]
+        if locations.shape[1] != 2:
             raise ValueError("Should be set with a pair of coordinates, or an array of coordinates.")
-        for i in range(self._locations.shape[0]):
-            self._locations[i] = self._source.lon_lat_to_tile_space(*self._locations[i])
+        if isinstance(self._source, (WebMercatorTiles, OrdnanceSurveyTiles)):
+            px, py = self._source.lon_lat_to_tile_space_array(locations[:,0], locations[:,1])
+        else:
+            px, py = _np.empty(len(locations)), _np.empty(len(locations))
+            for i, (lon, lat) in enumerate(locations.tolist()):
+                px[i], py[i] = self._source.lon_lat_to_tile_space(lon, lat)
+        # Stored as separate coordinate arrays, as `process` works column-wise
+        self._px = _np.ascontiguousarray(px, dtype=_np.float64)
+        self._py = _np.ascontiguousarray(py, dtype=_np.float64)
+        # Top-left corner of each icon, in tile space
+        self._pins = (self._px - self._offset[0], self._py - self._offset[1], dict())
+
+    def _pin_buckets(self, pins, width, height):
+        """Group the pins by which tiles, of this size, their icons overlap.
+        Built on first use for each tile size.
+
+        :return: Dictionary from `(tx, ty)` to a pair of arrays of the
+          corners of the icons which overlap that tile.
+        """
+        pinx, piny, cache = pins
+        buckets = cache.get((width, height))
+        if buckets is not None:
+            return buckets
+        # Icon at `x` overlaps tile `tx` exactly when `tx*width - iw < x < (tx+1)*width`
+        iw, ih = self._icon.size
+        xlow = _np.floor(pinx / width).astype(_np.int64).tolist()
+        xhigh = _np.ceil((pinx + iw) / width).astype(_np.int64).tolist()
+        ylow = _np.floor(piny / height).astype(_np.int64).tolist()
+        yhigh = _np.ceil((piny + ih) / height).astype(_np.int64).tolist()
+        indices = dict()
+        for i, (x0, x1, y0, y1) in enumerate(zip(xlow, xhigh, ylow, yhigh)):
+            for tx in range(x0, x1):
+                for ty in range(y0, y1):
+                    indices.setdefault((tx, ty), []).append(i)
+        buckets = {key : (pinx[index], piny[index]) for key, index in indices.items()}
+        cache[(width, height)] = buckets
+        return buckets
 
     def process(self, tile, tx, ty):
-        if len(self._locations) == 0:
+        if len(self._px) == 0:
             return tile
-        tx, ty = tx * tile.width, ty * tile.height
-        into_tile = self._locations - _np.asarray([tx,ty])[None,:] - self._offset
-        mask = (into_tile[:,0] > - self._icon.width) & (into_tile[:,1] > - self._icon.height)
-        mask &= (into_tile[:,0] < tile.width) & (into_tile[:,1] < tile.height)
-        into_tile = into_tile[mask]
-        if into_tile.shape[0] == 0:
+        width, height = tile.width, tile.height
+        candidates = self._pin_buckets(self._pins, width, height).get((tx, ty))
+        if candidates is None:
             return tile
-        if tile.mode != "RGB":
-            out = tile.convert("RGB")
-        else:
-            out = tile.copy()
-        for (x,y) in into_tile:
-            out.paste(self._icon, (int(x), int(y)), self._alpha)
+        px = candidates[0] - tx * width
+        py = candidates[1] - ty * height
+        # Called off the GUI thread, so the scratch space is per call
+        mask = _np.greater(px, - self._icon.width)
+        scratch = _np.empty_like(mask)
+        mask &= _np.greater(py, - self._icon.height, out=scratch)
+        mask &= _np.less(px, width, out=scratch)
+        mask &= _np.less(py, height, out=scratch)
+        index = _np.flatnonzero(mask)
+        if len(index) == 0:
+            return tile
+        out = tile.copy() if tile.mode == "RGB" else tile.convert("RGB")
+        xs = px[index].astype(_np.int64).tolist()
+        ys = py[index].astype(_np.int64).tolist()
+        for x, y in zip(xs, ys):
+            out.paste(self._icon, (x, y), self._alpha)
         return out
 
 
@@ -217,38 +301,110 @@ class WebMercatorTiles():
         if source is None:
             source = tilemapbase.tiles.OSM
         self._tile_provider = source
-        self._empty = self._out_of_range_tile()
+        self._empty = _empty_tile(self.tile_size)
+        self._approximate = False
+        self._fetch = _functools.lru_cache(maxsize=256)(self._fetch_tile)
         self.zoom = 0
 
-    def _out_of_range_tile(self):
-        tile = _Image.new("L", (self.tile_size, self.tile_size), 255)
-        draw = _ImageDraw.Draw(tile)
-        draw.line((0,0,self.tile_size,self.tile_size))
-        draw.line((0,self.tile_size,self.tile_size,0))
-        return tile
-
     def __call__(self, tx, ty):
-        maximum = 2 ** self._zoom
+        maximum = self._maximum
         if ty < 0 or ty >= maximum:
             return self._empty
         tx = tx % maximum
-        return self._tile_provider.get_tile(tx, ty, self._zoom)
+        try:
+            return self._fetch(tx, ty, self._zoom)
+        except _NoTile:
+            return None
+
+    def _fetch_tile(self, tx, ty, zoom):
+        # Failures raise, so that they are not cached
+        tile = self._tile_provider.get_tile(tx, ty, zoom)
+        if tile is None:
+            raise _NoTile()
+        tile.load()
+        return tile
 
     def lon_lat_to_tile_space(self, lon, lat):
         """Convert to actual tile coordinates."""
-        scale = 2 ** self._zoom * self.tile_size
-        x, y = tilemapbase.project(lon, lat)
+        scale = self._scale
+        if self._approximating():
+            ref = self._reference
+            if ref is not None and abs(lat - ref[0]) <= ref[3] and -180 <= lon <= 180:
+                return (lon + 180.0) * (scale / 360.0), (ref[1] + (lat - ref[0]) * ref[2]) * scale
+            x, y = _project(lon, lat)
+            self._reference = self._linear_reference(lat)
+            return x * scale, y * scale
+        x, y = _project(lon, lat)
         return x * scale, y * scale
 
+    def lon_lat_to_tile_space_array(self, lons, lats):
+        """As :meth:`lon_lat_to_tile_space` but converts arrays of coordinates
+        in one go.
+
+        :return: Pair `(x, y)` of arrays.
+        """
+        lons = _np.asarray(lons, dtype=_np.float64)
+        lats = _np.asarray(lats, dtype=_np.float64)
+        if _np.any((lons < -180) | (lons > 180) | (lats <= -90) | (lats >= 90)):
+            raise ValueError("Longitude/Latitude out of valid range [-180,180] / [-90,90].")
+        scale = self._scale
+        x = (lons + 180.0) * (scale / 360.0)
+        y = (0.5 - _np.arcsinh(_np.tan(_np.radians(lats))) / (2 * _np.pi)) * scale
+        return x, y
+
     def tile_space_to_lon_lat(self, x, y):
         """Convert actual tile coordinates to longitude and latitude.
         Returns :class:`math.nan` if not in range."""
-        scale = 2 ** self._zoom * self.tile_size
+        scale = self._scale
         x, y = x / scale, y / scale
         x = x % 1
         if x < 0 or y < 0 or x > 1 or y > 1:
             return _math.nan, _math.nan
-        return tilemapbase.to_lonlat(x, y)
+        if self._approximating():
+            ref = self._reference
+            if ref is not None and abs(y - ref[1]) <= ref[4]:
+                return x * 360 - 180, ref[0] + (y - ref[1]) / ref[2]
+            lon, lat = _to_lonlat(x, y)
+            self._reference = self._linear_reference(lat)
+            return lon, lat
+        return _to_lonlat(x, y)
+
+    @property
+    def approximate(self):
+        """Set to `True` to allow, at zoom levels of at least 10, replacing
+        the exact conversion of latitude by a linear approximation about a
+        recently converted latitude.  The approximation is only used close
+        enough to that latitude to be accurate to within half a pixel.
+        Default is `False`."""
+        return self._approximate
+
+    @approximate.setter
+    def approximate(self, v):
+        self._approximate = bool(v)
+        self._reference = None
+
+    def _approximating(self):
+        return self._approximate and self._zoom >= 10
+
+    def _linear_reference(self, lat):
+        """Linearise the projection of latitude about `lat`.  The neglected
+        quadratic term is `curvature * delta**2 / 2`, so keeping this under
+        half a pixel bounds `delta`; the cap keeps the cubic term negligible
+        near the equator.
+
+        :return: `(lat, y, dy/dlat, max change in lat, max change in y)` with
+          `y` in the unit square and latitudes in degrees.
+        """
+        scale = self._scale
+        phi = lat * _DEGREES_TO_RADIANS
+        y = 0.5 - _math.asinh(_math.tan(phi)) / (2 * _math.pi)
+        dy_dphi = -1 / (2 * _math.pi * _math.cos(phi))
+        curvature = abs(dy_dphi * _math.tan(phi))
+        delta = 2e-3
+        if curvature > 0:
+            delta = min(delta, _math.sqrt(1 / (scale * curvature)))
+        return (lat, y, dy_dphi * _DEGREES_TO_RADIANS, delta * _RADIANS_TO_DEGREES,
+            abs(dy_dphi) * delta)
 
     @property
     def zoom(self):
@@ -261,6 +417,9 @@ class WebMercatorTiles():
         if v < 0 or v > self.maxzoom:
             raise ValueError()
         self._zoom = v
+        self._maximum = 1 << v
+        self._scale = self._maximum * self.tile_size
+        self._reference = None
 
     @property
     def tile_size(self):
@@ -272,31 +431,49 @@ class WebMercatorTiles():
     
     @property
     def bbox(self):
-        size = (2 ** self._zoom) * self.tile_size
+        size = self._scale
         return (None, 0, None, size)
 
 
+# The `tilemapbase.ordnancesurvey` providers, and their caches, are not safe to
+# use from many threads at once, and some are shared between instances
+_OS_LOCK = _threading.Lock()
+
 class OrdnanceSurveyTiles():
     """Provides tiles from Ordnance Survey sources.  Base class which is
     over-ridden to specify the tiles."""
     def __init__(self):
-        self._empty = self._out_of_range_tile()
+        self._empty = _empty_tile(self.tile_size)
+        self._fetch = _functools.lru_cache(maxsize=256)(self._fetch_tile)
+        xmin, ymin, xmax, ymax = self._tile_provider.bounding_box
+        self._tile_bounds = (xmin, ymin - self.tile_size, xmax - self.tile_size, ymax)
+        self._pixels_per_metre = self.tile_size / self._tile_provider.size_in_meters
+        self._metres_per_pixel = self._tile_provider.size_in_meters / self.tile_size
+        bbox = [x * self.tile_size / self._tile_provider.size_in_meters
+                for x in self._tile_provider.bounding_box]
+        bbox[1], bbox[3] = -bbox[3], -bbox[1]
+        self._bbox = tuple(bbox)
 
     def __call__(self, tx, ty):
-        x = tx * self._tile_provider.size_in_meters + 0.5
-        y = (-1 - ty) * self._tile_provider.size_in_meters + 0.5
-        if (x < self._tile_provider.bounding_box[0]
-                or y < self._tile_provider.bounding_box[1] - self.tile_size
-                or x >= self._tile_provider.bounding_box[2] - self.tile_size
-                or y >= self._tile_provider.bounding_box[3]):
-            tile = self._empty
-        else:
-            try:
-                code = tilemapbase.ordnancesurvey.coords_to_os_national_grid(x, y)
-                tile = self._tile_provider(code)
-            except:
-                tile = self._empty
-        return tile
+        try:
+            return self._fetch(tx, ty)
+        except _NoTile:
+            # Not cached, so will be tried again when next needed
+            return None
+
+    def _fetch_tile(self, tx, ty):
+        size = self._tile_provider.size_in_meters
+        x = tx * size + 0.5
+        y = (-1 - ty) * size + 0.5
+        xmin, ymin, xmax, ymax = self._tile_bounds
+        if not (xmin <= x < xmax and ymin <= y < ymax):
+            return self._empty
+        try:
+            code = tilemapbase.ordnancesurvey.coords_to_os_national_grid(x, y)
+            with _OS_LOCK:
+                return self._tile_provider(code)
+        except Exception:
+            raise _NoTile()
 
     @property
     def tile_size(self):
@@ -304,30 +481,57 @@ class OrdnanceSurveyTiles():
 
     def tile_space_to_lon_lat(self, x, y):
         """Convert from the tile coordinates to longitude and latitude."""
-        x = x / self.tile_size * self._tile_provider.size_in_meters
-        y = -y / self.tile_size * self._tile_provider.size_in_meters
+        x = x * self._metres_per_pixel
+        y = -y * self._metres_per_pixel
         return tilemapbase.ordnancesurvey.to_lonlat(x, y)
 
     def lon_lat_to_tile_space(self, lon, lat):
         """Convert to tile coordinates."""
         x, y = tilemapbase.ordnancesurvey.project(lon, lat)
-        xx = _math.floor(x * self.tile_size / self._tile_provider.size_in_meters)
-        yy = _math.floor(-y * self.tile_size / self._tile_provider.size_in_meters)
+        xx = _math.floor(x * self._pixels_per_metre)
+        yy = _math.floor(-y * self._pixels_per_metre)
+        return xx, yy
+
+    def lon_lat_to_tile_space_array(self, lons, lats):
+        """As :meth:`lon_lat_to_tile_space` but converts arrays of coordinates
+        in one go.
+
+        :return: Pair `(x, y)` of integer arrays.
+        """
+        x, y = tilemapbase.ordnancesurvey.project(_np.asarray(lons, dtype=_np.float64),
+            _np.asarray(lats, dtype=_np.float64))
+        xx = _np.floor(_np.asarray(x) * self._pixels_per_metre).astype(_np.int64)
+        yy = _np.floor(-_np.asarray(y) * self._pixels_per_metre).astype(_np.int64)
         return xx, yy
 
     @property
     def bbox(self):
-        bbox = [x * self._tile_provider.tilesize / self._tile_provider.size_in_meters
-                for x in self._tile_provider.bounding_box]
-        bbox[1], bbox[3] = -bbox[3], -bbox[1]
-        return bbox
-
-    def _out_of_range_tile(self):
-        tile = _Image.new("L", (self.tile_size, self.tile_size), 255)
-        draw = _ImageDraw.Draw(tile)
-        draw.line((0,0,self.tile_size,self.tile_size))
-        draw.line((0,self.tile_size,self.tile_size,0))
-        return tile
+        return self._bbox
+
+
+# The `tilemapbase.ordnancesurvey` tile sources which are split into smaller
+# tiles, and the size, in pixels, of the tiles they natively provide.
+_OS_SPEC = {
+    "TwoFiftyScale" : None,
+    "VectorMapDistrict" : 4000,
+    "OpenMapLocal" : 5000,
+    "TwentyFiveRaster" : 4000,
+    "MasterMap" : 3200
+    }
+
+@_functools.lru_cache(maxsize=None)
+def _os_provider(kind, scale=1, size=200):
+    """Construct the tile provider for the source `kind`, a key of `_OS_SPEC`,
+    rescaled by `scale` and split into tiles of size `size`.  Shared between
+    all users, as constructing a source searches the disk for its files, and
+    the provider caches tiles."""
+    tp = getattr(tilemapbase.ordnancesurvey, kind)()
+    if scale != 1:
+        native_size = _OS_SPEC[kind]
+        if native_size is None:
+            raise ValueError("Tiles from {} cannot be scaled".format(kind))
+        tp = tilemapbase.ordnancesurvey.TileScalar(tp, int(native_size * scale + 0.5))
+    return tilemapbase.ordnancesurvey.TileSplitter(tp, size)
 
 
 class OSOverView(OrdnanceSurveyTiles):
@@ -335,7 +539,8 @@ class OSOverView(OrdnanceSurveyTiles):
     This is one of a number of single files of size 4000 x 3200.
 
     Use the attributes :attr:`filenames` and :attr:`filename_choice`
-    to change which file to use.
+    to change which file to use; then call :meth:`MapImage.clear_cache` on
+    any widget already displaying these tiles.
     """
     def __init__(self):
         self._tile_provider = tilemapbase.ordnancesurvey.OverView()
@@ -352,13 +557,15 @@ class OSOverView(OrdnanceSurveyTiles):
     @filename_choice.setter
     def filename_choice(self, v):
         self._tile_provider.filename = v
+        self._fetch.cache_clear()
 
 
 class OSMiniScale(OrdnanceSurveyTiles):
     """A large scale map of the UK of size 7000 x 13000.
 
     Use the attributes :attr:`filenames` and :attr:`filename_choice`
-    to change which file to use.
+    to change which file to use; then call :meth:`MapImage.clear_cache` on
+    any widget already displaying these tiles.
     """
     def __init__(self):
         tp = tilemapbase.ordnancesurvey.MiniScale()
@@ -376,13 +583,13 @@ class OSMiniScale(OrdnanceSurveyTiles):
     @filename_choice.setter
     def filename_choice(self, v):
         self._tile_provider.filename = v
+        self._fetch.cache_clear()
 
 
 class OSTwoFiftyScale(OrdnanceSurveyTiles):
     """1:250 000 Scale Colour Raster tiles.  25 metres to the pixel."""
     def __init__(self):
-        tp = tilemapbase.ordnancesurvey.TwoFiftyScale()
-        self._tile_provider = tilemapbase.ordnancesurvey.TileSplitter(tp, 200)
+        self._tile_provider = _os_provider("TwoFiftyScale")
         super().__init__()
     
 
@@ -392,10 +599,7 @@ class OSVectorMapDistrict(OrdnanceSurveyTiles):
     :param scale: If not 1, then the fraction to scale the tile size by.
     """
     def __init__(self, scale=1, size=200):
-        tp = tilemapbase.ordnancesurvey.VectorMapDistrict()
-        if scale != 1:
-            tp = tilemapbase.ordnancesurvey.TileScalar(tp, int(4000 * scale + 0.5))
-        self._tile_provider = tilemapbase.ordnancesurvey.TileSplitter(tp, size)
+        self._tile_provider = _os_provider("VectorMapDistrict", scale, size)
         super().__init__()
     
 
@@ -416,10 +620,7 @@ class OSOpenMapLocal(OrdnanceSurveyTiles):
     :param scale: If not 1, then the fraction to scale the tile size by.
     """
     def __init__(self, scale=1, size=200):
-        tp = tilemapbase.ordnancesurvey.OpenMapLocal()
-        if scale != 1:
-            tp = tilemapbase.ordnancesurvey.TileScalar(tp, int(5000 * scale + 0.5))
-        self._tile_provider = tilemapbase.ordnancesurvey.TileSplitter(tp, size)
+        self._tile_provider = _os_provider("OpenMapLocal", scale, size)
         super().__init__()
 
 
@@ -432,10 +633,7 @@ class OSOpenMapLocalHalf(OSOpenMapLocal):
 
 class OS25kRaster(OrdnanceSurveyTiles):
     def __init__(self, scale=1):
-        tp = tilemapbase.ordnancesurvey.TwentyFiveRaster()
-        if scale != 1:
-            tp = tilemapbase.ordnancesurvey.TileScalar(tp, int(4000 * scale + 0.5))
-        self._tile_provider = tilemapbase.ordnancesurvey.TileSplitter(tp, 200)
+        self._tile_provider = _os_provider("TwentyFiveRaster", scale)
         super().__init__()
 
 
@@ -451,10 +649,7 @@ class OS25kRasterQuarter(OS25kRaster):
 
 class OSMasterMap1000(OrdnanceSurveyTiles):
     def __init__(self, scale=1, size=200):
-        tp = tilemapbase.ordnancesurvey.MasterMap()
-        if scale != 1:
-            tp = tilemapbase.ordnancesurvey.TileScalar(tp, int(3200 * scale + 0.5))
-        self._tile_provider = tilemapbase.ordnancesurvey.TileSplitter(tp, size)
+        self._tile_provider = _os_provider("MasterMap", scale, size)
         super().__init__()
 
 
@@ -7,11 +7,29 @@ Handles generating large / infinite images from tiles.
 
 import math as _math
 import threading as _threading
-import time as _time
+import array as _array
+import collections as _collections
+import functools as _functools
+import itertools as _itertools
 import queue
+import tkinter as _tk
 import PIL.Image
 from . import image
 import logging as _logging
+import time as _time
+
+@_functools.lru_cache(maxsize=128)
+def _compute_needed(window, clamp, border, tw, th):
+    """The buffer, in pixels, for the `window` with a `border` of tiles, kept
+    within `clamp`.  Pure, so that results can be cached."""
+    wxmin, wymin, wxmax, wymax = window
+    bxmin, bymin, bxmax, bymax = clamp
+    xmin = max((_math.floor(wxmin / tw) - border) * tw, bxmin)
+    ymin = max((_math.floor(wymin / th) - border) * th, bymin)
+    xmax = min((_math.ceil(wxmax / tw) + border) * tw, bxmax)
+    ymax = min((_math.ceil(wymax / th) + border) * th, bymax)
+    return (xmin, ymin, xmax, ymax)
+
 
 class TileWindow():
     """Internal class which stores details of a large or infinite image:
@@ -36,6 +54,7 @@ class TileWindow():
         self._tile_width = tilewidth
         self._tile_height = tileheight
         
+        self._bounds = None
         self.image_bounds = (None, None, None, None)
         self.window = (0, 0, self._tile_width, self._tile_height)
         self.border = 1
@@ -64,18 +83,32 @@ class TileWindow():
             return x
         return int(x)
 
+    @staticmethod
+    def _four_tuple(v, convert, message):
+        """Apply `convert` to each entry of `v`, checking there are 4 of them,
+        and raising :class:`ValueError` with `message` on failure."""
+        try:
+            v = tuple(convert(x) for x in v)
+        except (TypeError, ValueError):
+            raise ValueError(message)
+        if len(v) != 4:
+            raise ValueError(message)
+        return v
+
     @image_bounds.setter
     def image_bounds(self, v):
-        try:
-            v = tuple(self._int_or_none(x) for x in v)
-            assert len(v) == 4
-            assert v[0] is None or v[0] % self.tile_width == 0
-            assert v[1] is None or v[1] % self.tile_height == 0
-            assert v[2] is None or v[2] % self.tile_width == 0
-            assert v[3] is None or v[3] % self.tile_height == 0
-            self._bounds = v
-        except:
-            raise ValueError("Should be a tuple of length 4.")
+        message = "Should be a tuple of length 4."
+        v = self._four_tuple(v, self._int_or_none, message)
+        if v == self._bounds:
+            return
+        tw, th = self._tile_width, self._tile_height
+        for bound, size in zip(v, (tw, th, tw, th)):
+            if bound is not None and bound % size != 0:
+                raise ValueError(message)
+        self._bounds = v
+        inf = _math.inf
+        self._clamp = tuple(bound if bound is not None else default
+            for bound, default in zip(v, (-inf, -inf, inf, inf)))
 
     @property
     def tile_width(self):
@@ -94,12 +127,7 @@ class TileWindow():
 
     @window.setter
     def window(self, v):
-        try:
-            v = tuple(int(x) for x in v)
-            assert len(v) == 4
-            self._window = v
-        except:
-            raise ValueError("Should be a tuple of 4 integers")
+        self._window = self._four_tuple(v, int, "Should be a tuple of 4 integers")
 
     @property
     def border(self):
@@ -111,12 +139,14 @@ class TileWindow():
 
     @border.setter
     def border(self, v):
+        message = "Should be an integer >= 1"
         try:
             v = int(v)
-            assert v > 0
-            self._border = v
-        except:
-            raise ValueError("Should be an integer >= 1")
+        except (TypeError, ValueError):
+            raise ValueError(message)
+        if v <= 0:
+            raise ValueError(message)
+        self._border = v
 
     @property
     def buffer_extent(self):
@@ -137,40 +167,25 @@ class TileWindow():
 
     @buffer_extent.setter
     def buffer_extent(self, v):
-        try:
-            v = tuple(int(x) for x in v)
-            assert len(v) == 4
-            assert v[0] % self.tile_width == 0
-            assert v[2] % self.tile_width == 0
-            assert v[1] % self.tile_height == 0
-            assert v[3] % self.tile_height == 0
-            self._buffer = v
-        except:
-            raise ValueError("Should be a tuple (xmin, ymin, xmax, ymax), multiples of the tile size.")
+        message = "Should be a tuple (xmin, ymin, xmax, ymax), multiples of the tile size."
+        v = self._four_tuple(v, int, message)
+        tw, th = self._tile_width, self._tile_height
+        if v[0] % tw != 0 or v[2] % tw != 0 or v[1] % th != 0 or v[3] % th != 0:
+            raise ValueError(message)
+        self._buffer = v
+
+    def _set_buffer_extent_fast(self, v):
+        """Set :attr:`buffer_extent` without checking; for internal use with a
+        tuple of integers already aligned to the tiles."""
+        self._buffer = v
 
     @property
     def needed_buffer_extent(self):
         """Given the current :attr:`window` and :attr:`border`, and taking
         account of :attr:`image_bounds`, what is the buffer we need?  Returns
         `(xmin, ymin, xmax, ymax)` as :attr:`buffer_extent`"""
-        # In "tile space"
-        xmin = _math.floor(self.window[0] / self.tile_width) - self.border
-        ymin = _math.floor(self.window[1] / self.tile_height) - self.border
-        xmax = _math.ceil(self.window[2] / self.tile_width) + self.border
-        ymax = _math.ceil(self.window[3] / self.tile_height) + self.border
-        xmin *= self.tile_width
-        xmax *= self.tile_width
-        ymin *= self.tile_height
-        ymax *= self.tile_height
-        if self.image_bounds[0] is not None:
-            xmin = max(xmin, self.image_bounds[0])
-        if self.image_bounds[2] is not None:
-            xmax = min(xmax, self.image_bounds[2])
-        if self.image_bounds[1] is not None:
-            ymin = max(ymin, self.image_bounds[1])
-        if self.image_bounds[3] is not None:
-            ymax = min(ymax, self.image_bounds[3])
-        return (xmin, ymin, xmax, ymax)
+        return _compute_needed(self._window, self._clamp, self._border,
+            self._tile_width, self._tile_height)
 
 
 class Tiler(TileWindow):
@@ -189,11 +204,18 @@ class Tiler(TileWindow):
             tileheight = tilewidth
         super().__init__(tilewidth, tileheight, **kwargs)
         self._lock = _threading.RLock()
-        self._tiles = dict()
+        # Least recently used first; trimmed to `_max_tiles` by `_update`
+        self._tiles = _collections.OrderedDict()
+        self._max_tiles = 0
+        # Bumped by `clear_cache`, so tiles from before can be recognised
+        self._generation = 0
         self.window = (0,0,0,0)
         self.buffer_extent = (0,0,0,0)
         self._marsher = _TileJobMarsher()
         self._redrawer = None
+        self._last_update = None
+        # The extent which `_image` actually shows; may lag `buffer_extent`
+        self._image_extent = (0, 0, 0, 0)
         
     def update(self, location, size):
         """To be called with the values of `current_location` and `size` from
@@ -203,47 +225,101 @@ class Tiler(TileWindow):
         :param size: `(width, height)` of the currently viewed image.
           Maybe `None` to indicate no update
         """
-        x = self.buffer_extent[0] + location[0]
-        y = self.buffer_extent[1] + location[1]
         if size is None:
             size = (self.window[2] - self.window[0], self.window[3] - self.window[1])
-        self.window = (x, y, x + size[0], y + size[1])
+        # Nothing which decides the needed buffer has changed
+        key = (tuple(location), tuple(size), self.buffer_extent, self.image_bounds, self.border)
+        if key == self._last_update:
+            return
+        self._last_update = key
+        x = self.buffer_extent[0] + int(location[0])
+        y = self.buffer_extent[1] + int(location[1])
+        self._window = (x, y, x + int(size[0]), y + int(size[1]))
+        # Movement within the current buffer needs no further work
+        if self.needed_buffer_extent == self.buffer_extent:
+            return
         self._update()
 
-    def _update(self):
+    def clear_cache(self):
+        """Forget all stored tiles, and request again those in the buffer.
+        Call this when the provider changes the tiles it returns."""
+        with self._lock:
+            self._generation += 1
+            self._tiles.clear()
+            # The current image is made of old tiles, so is not to be reused
+            self._image_extent = (0, 0, 0, 0)
+        self._last_update = None
+        self._update(force=True)
+
+    def _update(self, force=False):
         need = self.needed_buffer_extent
-        if need == self.buffer_extent:
+        if need == self.buffer_extent and not force:
             return
 
-        need_tile_space = (need[0] // self.tile_width, need[1] // self.tile_height,
-            need[2] // self.tile_width, need[3] // self.tile_height)
+        tw, th = self._tile_width, self._tile_height
+        need_tile_space = (need[0] // tw, need[1] // th, need[2] // tw, need[3] // th)
 
         # If we don't have an infinite window, these can become negative if the view
         # is scrolled too far.
         need_width = max(0, need[2] - need[0])
         need_height = max(0, need[3] - need[1])
-        new_image = PIL.Image.new("RGB", (need_width, need_height))
-        
-        tiles_needed = []
-        for y in range(need_tile_space[3] - need_tile_space[1]):
-            ty = y + need_tile_space[1]
-            ydest = y * self.tile_height
-            for x in range(need_tile_space[2] - need_tile_space[0]):
-                tx = x + need_tile_space[0]
-                xdest = x * self.tile_width
-                if (tx, ty) in self._tiles:
-                    new_image.paste(self._tiles[(tx, ty)], (xdest, ydest))
-                else:
-                    tiles_needed.append( (tx, ty) )
 
+        tiles, tiles_needed = self._tiles, []
+        x0, y0, x1, y1 = need_tile_space
         with self._lock:
-            keys = set(self._tiles.keys())
-            for (tx, ty) in keys:
-                if not (tx >= need_tile_space[0] and tx < need_tile_space[2] and
-                    ty >= need_tile_space[1] and ty < need_tile_space[3]):
-                    del self._tiles[(tx,ty)]
+            # Copy the part of the current image which we still need in one go
+            old = self._image_extent
+            ox0, oy0 = max(need[0], old[0]), max(need[1], old[1])
+            ox1, oy1 = min(need[2], old[2]), min(need[3], old[3])
+            if ox0 < ox1 and oy0 < oy1:
+                # Every pixel outside this region is written below, by a tile
+                # or by `blank`, so there is no need to clear the image first
+                new_image = PIL.Image.new("RGB", (need_width, need_height), None)
+                region = self._image.crop((ox0 - old[0], oy0 - old[1], ox1 - old[0], oy1 - old[1]))
+                new_image.paste(region, (ox0 - need[0], oy0 - need[1]))
+                blank = (0, 0, 0)
+            else:
+                new_image = PIL.Image.new("RGB", (need_width, need_height))
+                ox0, oy0, ox1, oy1 = 0, 0, 0, 0
+                blank = None
+            # Per column / row: tile index, destination, and whether the
+            # copied region already covers it
+            columns = [(tx, tx * tw - need[0], ox0 <= tx * tw and (tx + 1) * tw <= ox1)
+                for tx in range(x0, x1)]
+            rows = [(ty, ty * th - need[1], oy0 <= ty * th and (ty + 1) * th <= oy1)
+                for ty in range(y0, y1)]
+            get, touch = tiles.get, tiles.move_to_end
+            paste, append = new_image.paste, tiles_needed.append
+            for ty, ydest, copied_y in rows:
+                for tx, xdest, copied_x in columns:
+                    key = (tx, ty)
+                    tile = get(key)
+                    if tile is None:
+                        append(key)
+                        if blank is not None and not (copied_x and copied_y):
+                            paste(blank, (xdest, ydest, xdest + tw, ydest + th))
+                        continue
+                    touch(key)
+                    if not (copied_x and copied_y):
+                        paste(tile, (xdest, ydest))
+
+            # Keep tiles outside the buffer, in case the user scrolls back.
+            # Sized from the window, as `need` can be empty, or even
+            # negative, if the view is scrolled past the image bounds.
+            wx0, wy0, wx1, wy1 = self._window
+            columns = max(0, wx1 - wx0) // tw + 2 * self._border + 2
+            rows = max(0, wy1 - wy0) // th + 2 * self._border + 2
+            self._max_tiles = columns * rows * 5
+            while len(tiles) > self._max_tiles:
+                tiles.popitem(last=False)
             self._image = new_image
-            self.buffer_extent = need
+            self._image_extent = need
+            self._set_buffer_extent_fast(need)
+            # Jobs are taken from the end, so put the tiles nearest the
+            # centre of the window last
+            cx = (self._window[0] + self._window[2]) / (2 * tw) - 0.5
+            cy = (self._window[1] + self._window[3]) / (2 * th) - 0.5
+            tiles_needed.sort(key = lambda t : -((t[0] - cx) ** 2 + (t[1] - cy) ** 2))
             self._marsher.set_needed_tiles(tiles_needed)
         self._redraw()
 
@@ -255,19 +331,41 @@ class Tiler(TileWindow):
         """
         return self._marsher.get(timeout)
 
-    def new_tile(self, tx, ty, tile):
-        """Send a new tile at position `(tx, ty)`."""
+    def drain(self):
+        """Remove and return, without waiting, all the tile coords `(tx, ty)`
+        which currently need fetching."""
+        return self._marsher.drain()
+
+    @property
+    def generation(self):
+        """Increased by each call to :meth:`clear_cache`.  Read this just
+        before asking the provider for a tile, and pass it to :meth:`new_tile`.
+        """
+        return self._generation
+
+    def new_tile(self, tx, ty, tile, generation=None):
+        """Send a new tile at position `(tx, ty)`.
+
+        :param generation: If not `None`, the value of :attr:`generation`
+          when the tile was requested from the provider.  Tiles requested
+          before a call to :meth:`clear_cache` are ignored.
+        """
         if tile is None:
             return
         new_image = None
+        tw, th = self._tile_width, self._tile_height
+        x, y = tx * tw, ty * th
         with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            # Even tiles outside the buffer are kept, for later reuse
             self._tiles[(tx, ty)] = tile
-            x, y = tx * self.tile_width, ty * self.tile_height
-            xdest = x - self.buffer_extent[0]
-            ydest = y - self.buffer_extent[1]
+            self._tiles.move_to_end((tx, ty))
+            extent = self._image_extent
+            xdest = x - extent[0]
+            ydest = y - extent[1]
             if (xdest >= 0 and ydest >= 0 and
-                x + self.tile_width <= self.buffer_extent[2] and
-                y + self.tile_height <= self.buffer_extent[3]):
+                x + tw <= extent[2] and y + th <= extent[3]):
                 self._image.paste(tile, (xdest, ydest))
                 new_image = self._image
         if new_image is not None:
@@ -302,25 +400,25 @@ class Tiler(TileWindow):
     def _redraw(self):
         if self.redrawer is None:
             return
-        with self._lock:
-            image = self._image
-            x = self.window[0] - self.buffer_extent[0]
-            y = self.window[1] - self.buffer_extent[1]
-        self.redrawer(image, (x,y))
+        # These are only replaced by `update`, on the same thread as us, and
+        # `new_tile` only pastes into the image, so no need to lock
+        image, window, extent = self._image, self._window, self._buffer
+        self.redrawer(image, (window[0] - extent[0], window[1] - extent[1]))
 
 
 class _TileJobMarsher():
     """Pulled out functionality to think hard about synchronization."""
     def __init__(self):
-        self._needed_tiles = []
-        self._lock = _threading.RLock()
-        self._job_queue = queue.Queue()
+        # Flattened `tx0, ty0, tx1, ty1, ...`; jobs are taken from the end.
+        self._needed_tiles = _array.array("l")
+        self._condition = _threading.Condition(_threading.Lock())
 
     def set_needed_tiles(self, tile_list):
         """Set a new list of needed tiles."""
-        with self._lock:
-            self._needed_tiles = tile_list
-        self._job_queue.put(True)
+        needed = _array.array("l", _itertools.chain.from_iterable(tile_list))
+        with self._condition:
+            self._needed_tiles = needed
+            self._condition.notify_all()
 
     def get(self, timeout=None):
         """Get the next tile coords `(tx, ty)` which needs fetching.
@@ -328,18 +426,30 @@ class _TileJobMarsher():
         :param timeout: If not `None` then wait this many seconds for a job,
           before raising :class:`queue.Empty`
         """
-        now = _time.clock()
-        while timeout is None or _time.clock() < now + timeout:
-            with self._lock:
-                if len(self._needed_tiles) > 0:
-                    return self._needed_tiles.pop()
-            self._job_queue.get(timeout=timeout)
-        raise queue.Empty()
+        with self._condition:
+            if not self._condition.wait_for(lambda : self._needed_tiles, timeout):
+                raise queue.Empty()
+            ty = self._needed_tiles.pop()
+            return self._needed_tiles.pop(), ty
+
+    def drain(self):
+        """Remove and return all currently needed tiles, without blocking.
+
+        :return: A list of tile coords `(tx, ty)`, in the order in which
+          :meth:`get` would have returned them.
+        """
+        with self._condition:
+            needed = self._needed_tiles
+            self._needed_tiles = _array.array("l")
+        return list(zip(needed[-2::-2], needed[::-2]))
 
 
 class TileProvider():
     """The interface for providing a tile.  Will be run in a different thread,
     and so should not interact with the `tkinter` code.
+
+    Returned tiles are only ever read from, never modified, so it is safe to
+    return the same (for example, cached) image more than once.
     """
     def __call__(self, tx, ty):
         raise NotImplementedError()
@@ -353,20 +463,37 @@ class TileImage(image.Image):
     :param provider: The :class:`TileProvider` class.
     :param tilewidth: Width of each tile.
     :param tileheight: Height of each tile, or `None` for square tiles.
+    :param workers: The number of threads calling `provider`.  If more than
+      one, then `provider` must be safe to call from many threads at once.
+
+    New tiles are shown by sending a `<<TileNewImage>>` event from the worker
+    threads.  Until such an event has been seen to arrive, and again after one
+    cannot be sent (for example, if the main loop is not running), we instead
+    check for new tiles every half second.
     """
-    def __init__(self, parent, provider, tilewidth, tileheight=None, **kwargs):
+    def __init__(self, parent, provider, tilewidth, tileheight=None, workers=1, **kwargs):
+        if workers < 1:
+            raise ValueError("Need at least one worker thread")
         super().__init__(parent, free=True, **kwargs)
         self.mouse_handler = None
         self._provider = provider
         self._tiler = Tiler(tilewidth, tileheight)
         self._tiler.redrawer = self.Redrawer(self)
-        self._pooler = self.Pooler(self)
+        self._poolers = [self.Pooler(self) for _ in range(workers)]
         self._done = False
         self._lock = _threading.RLock()
         self._waiting_image = None
-        self._pooler.start()
+        self._last_set_image = 0.0
+        # Workers only send events once the watchdog has run, from the main
+        # loop, as before then `event_generate` would block
+        self._dispatching = False
+        self._events_working = False
+        self._watchdog_pending = False
+        self.bind("<<TileNewImage>>", self._new_image_event)
+        for pooler in self._poolers:
+            pooler.start()
         self._tiler.update((0,0),(100,100))
-        self.after(100, self._update)
+        self._arm_watchdog()
 
     @property
     def tiler(self):
@@ -376,11 +503,13 @@ class TileImage(image.Image):
     def notify_of_gap(self, left, top, right, bottom):
         """Handles messages from the super class indicating the user has
         moved the image."""
+        self._arm_watchdog()
         self._tiler.update(self.current_location, self.size)
     
     def destroy(self):
         self._done = True
-        self._pooler.cancel()
+        for pooler in self._poolers:
+            pooler.cancel()
         super().destroy()
 
     def move_tile_view_to(self, x, y):
@@ -391,9 +520,14 @@ class TileImage(image.Image):
         buffer_height = buffer_extent[3] - buffer_extent[1]
         xx = _math.floor(x / self._tiler.tile_width) * self._tiler.tile_width
         yy = _math.floor(y / self._tiler.tile_height) * self._tiler.tile_height
-        self._tiler.buffer_extent = (xx, yy, xx + buffer_width, yy + buffer_height)
+        self._tiler._set_buffer_extent_fast((xx, yy, xx + buffer_width, yy + buffer_height))
         self._tiler.update((x - xx,y - yy), None)
 
+    def clear_cache(self):
+        """Forget all cached tiles, and fetch afresh those currently needed.
+        Call this if the `provider` starts to return different tiles."""
+        self._tiler.clear_cache()
+
     @property
     def tile_window(self):
         """The current view in "tile space".  Querying :attr:`current_location`
@@ -403,26 +537,68 @@ class TileImage(image.Image):
         """
         return self._tiler.window
 
+    # Shortest time between showing images sent by the tiler; around one frame
+    _MIN_REDRAW_INTERVAL = 0.016
+
+    # How often to check for new tiles while events are not known to work
+    _WATCHDOG_INTERVAL = 500
+
+    def _arm_watchdog(self):
+        """On the GUI thread, start polling if events are not known to work."""
+        if not self._events_working and not self._watchdog_pending:
+            self._watchdog_pending = True
+            self.after_idle(self._watchdog)
+
+    def _watchdog(self):
+        """Runs on the GUI thread, so the main loop must be dispatching."""
+        self._watchdog_pending = False
+        if self._done:
+            return
+        self._dispatching = True
+        self._update()
+        if not self._events_working:
+            self._watchdog_pending = True
+            self.after(self._WATCHDOG_INTERVAL, self._watchdog)
+
+    def _new_image_event(self, event):
+        self._events_working = True
+        self._update()
+
     def _update(self):
+        if self._done or self._waiting_image is None:
+            return
+        wait = self._last_set_image + self._MIN_REDRAW_INTERVAL - _time.monotonic()
+        if wait > 0:
+            # Later tiles overwrite the waiting image, so are shown together
+            self.after(int(wait * 1000) + 1, self._update)
+            return
         with self._lock:
-            if self._waiting_image is not None:
-                image = self._waiting_image
-                self._waiting_image = None
-            else:
-                image = None
+            image = self._waiting_image
+            self._waiting_image = None
         if image is not None:
             self.set_image(image, None)
-        if not self._done:
-            self.after(100, self._update)
 
     def _new_image(self, image):
         """May be called off thread"""
         with self._lock:
+            # Only one event is needed until the GUI thread collects the image
+            notify = self._waiting_image is None
             self._waiting_image = image
+        # Before the main loop runs, `event_generate` from another thread
+        # blocks for around a second before failing
+        if notify and self._dispatching and not self._done:
+            try:
+                self.event_generate("<<TileNewImage>>", when="tail")
+            except (_tk.TclError, RuntimeError):
+                # Widget destroyed, or main loop stopped: the image stays
+                # waiting, until the watchdog is re-armed from the GUI thread
+                self._dispatching = False
+                self._events_working = False
 
     def set_image(self, image, location):
         with self._lock:
             self._waiting_image = None
+        self._last_set_image = _time.monotonic()
         super().set_image(image, location=location)
 
     @property
@@ -447,9 +623,11 @@ class TileImage(image.Image):
         def run(self):
             while not self._cancel:
                 try:
-                    tx, ty = self._parent._tiler.get(timeout=0.1)
+                    tiler = self._parent._tiler
+                    tx, ty = tiler.get(timeout=0.1)
+                    generation = tiler.generation
                     tile = self._parent._provider(tx, ty)
-                    self._parent._tiler.new_tile(tx, ty, tile)
+                    tiler.new_tile(tx, ty, tile, generation)
                 except queue.Empty:
                     pass
                 except:
@@ -35,7 +35,8 @@ class DragTrack():
     def __init__(self, widget, button=1, additive=False):
         self.callback = None
         self.release_callback = None
-        self._drag_track_start = None
+        self._dragging = False
+        self._drag_track_x, self._drag_track_y = 0, 0
         self._drag_track_button = button
         if button == 1:
             self._drag_track_button_mask = 256
@@ -87,20 +88,22 @@ class DragTrack():
         if self.notify(event, "down"):
             return
         if event.num == self._drag_track_button:
-            self._drag_track_start = (event.x, event.y)
+            self._drag_track_x, self._drag_track_y = event.x, event.y
+            self._dragging = True
             self.moved(0, 0, True)
 
     def _up(self, event):
         if self.notify(event, "up"):
             return
-        self._drag_track_start = None
+        self._dragging = False
         self.released()
 
     def _motion(self, event):
         if self.notify(event, "motion"):
             return
-        if self._drag_track_start is None:
+        if not self._dragging:
             return
         if not (event.state & self._drag_track_button_mask):
             self._up(None)
-        self.moved(event.x - self._drag_track_start[0], event.y - self._drag_track_start[1], False)
+            return
+        self.moved(event.x - self._drag_track_x, event.y - self._drag_track_y, False)
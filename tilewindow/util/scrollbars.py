@@ -21,10 +21,15 @@ class Scrollbar(ttk.Scrollbar):
     def __init__(self, *args, **kwargs):
         self._our_needed = True
         self._our_callback = None
+        self._our_last_set = None
         super().__init__(*args, **kwargs)
 
     def set(self, start, end):
         """Listens to the usual `tkinter` method to change the scrollbar."""
+        # Avoid a round trip to Tcl if nothing has changed
+        if (start, end) == self._our_last_set:
+            return
+        self._our_last_set = (start, end)
         previous = self._our_needed
         if start <= 0 and end >= 1:
             self._our_needed = False
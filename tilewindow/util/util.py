@@ -6,6 +6,7 @@ Some basic `tkinter` utilities
 """
 
 #import tkinter as tk
+import functools as _functools
 
 def screen_size(widget):
     """Find the dimensions of the screen.
@@ -55,3 +56,25 @@ def stretch(widget, rows=None, columns=None):
     if columns is not None:
         for c in columns:
             widget.columnconfigure(c, weight=1)
+
+@_functools.lru_cache(maxsize=8)
+def testpattern(width, height):
+    """A simple RGB test image: the red channel is `x % 256`, the green
+    channel `y % 256` and the blue channel `(x + y) % 256`.  Results are
+    cached, so the returned array is read-only.  Requires `numpy`.
+
+    :param width: Width of the image.
+    :param height: Height of the image.
+
+    :return: A C-contiguous `numpy` array of shape `(height, width, 3)` and
+      type `uint8`, suitable for passing to `PIL.Image.fromarray`.
+    """
+    import numpy as np
+    xs = np.arange(width, dtype=np.uint16)
+    ys = np.arange(height, dtype=np.uint16)
+    data = np.empty((height, width, 3), dtype=np.uint8)
+    data[:,:,0] = (xs & 0xFF)[None,:]
+    data[:,:,1] = (ys & 0xFF)[:,None]
+    data[:,:,2] = np.add.outer(ys, xs) & 0xFF
+    data.flags.writeable = False
+    return data